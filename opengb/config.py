@@ -20,4 +20,10 @@ define('serial_port', default=None,
 define('lcd_gpio_pin', default=None, type=int,
        help='RasPi GPIO pin used to simulate an lcd button press (use "None" '
              'to disable)')
+define('printer_threaded', default=False,
+       help='Run printer as a thread in the server process rather than as a '
+            'separate process')
+define('event_codec', default='json',
+       help='Encoding of events sent from printer to server ("json" or '
+            '"msgpack")')
 define('frontend', default='opengb', help='Frontend (use "None" to disable)')
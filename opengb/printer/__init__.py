@@ -4,9 +4,15 @@ OpenGB Printer.
 
 from opengb.printer.base import State 
 from opengb.printer.base import StateEncoder 
+from opengb.printer.base import decode_event
+from opengb.printer.base import TELEMETRY_EVENTS
 from opengb.printer.base import IPrinter
+from opengb.printer.base import ThreadedIPrinter
+from opengb.printer.base import threaded
 from opengb.printer.base import PrinterCallbacks
 from opengb.printer.base import QueuedPrinterCallbacks
 from opengb.printer.base import NotReadyException 
+from opengb.printer.ipc import EventRing
+from opengb.printer.ipc import Telemetry
 from opengb.printer.dummy import Dummy 
 from opengb.printer.marlin import Marlin
@@ -2,10 +2,199 @@
 Printer exceptions and interface.
 """
 
+import os
+import time
 import multiprocessing
+import threading
+import collections
 import abc
 import json
 import enum
+import operator
+from json.encoder import encode_basestring_ascii
+
+from opengb.printer.ipc import local_pipe
+
+MSGPACK = True
+try:
+    import msgpack
+except ImportError:
+    # Events can only be JSON-encoded.
+    MSGPACK = False
+
+ORJSON = True
+try:
+    import orjson
+except ImportError:
+    # Events are JSON-encoded using the standard library.
+    ORJSON = False
+
+
+# Events which are batched by :class:`QueuedPrinterCallbacks` mapped to the
+# maximum number of each held per batch (`None` for unlimited). Events held
+# singly are coalesced, keeping the latest non-`None` value of each parameter.
+BATCHED_EVENTS = {
+    'temp_update':      1,
+    'position_update':  None,
+}
+# Maximum time for which a batched event is held before being published.
+BATCH_INTERVAL_SEC = 0.05
+# Number of pending batched events which triggers an immediate flush.
+BATCH_MAX_EVENTS = 256
+# Maximum total size of the encoded events in a batch.
+BATCH_MAX_BYTES = 64 * 1024
+# Minimum time between temperature updates unless a temperature changes by
+# at least `TEMP_UPDATE_MIN_DELTA` degrees.
+TEMP_UPDATE_MIN_INTERVAL_SEC = 0.1
+TEMP_UPDATE_MIN_DELTA = 0.5
+
+# Fixed-shape events published by :class:`QueuedPrinterCallbacks` mapped to
+# their parameter names, in the order in which values are passed.
+EVENT_SCHEMAS = {
+    'log':                      ('level', 'msg'),
+    'state_change':             ('old', 'new'),
+    'speed_override_change':    ('percent',),
+    'extrude_override_change':  ('percent',),
+    'fan_speed_change':         ('fan', 'percent'),
+    'temp_update':              ('bed_current', 'bed_target',
+                                 'nozzle1_current', 'nozzle1_target',
+                                 'nozzle2_current', 'nozzle2_target'),
+    'position_update':          ('x', 'y', 'z'),
+    'progress_update':          ('current_line', 'total_lines'),
+    'steppers_update':          ('enabled',),
+}
+
+# Events written to a :class:`opengb.printer.ipc.Telemetry`, when one is
+# given, instead of being published.
+TELEMETRY_EVENTS = {name: EVENT_SCHEMAS[name]
+                    for name in ('temp_update', 'position_update')}
+
+# Encoder used for all printer events. Creating it once avoids building a new
+# JSONEncoder on every call, which `json.dumps` does whenever it is passed
+# non-default arguments. Compact separators keep the encoded events small.
+_dumps = json.JSONEncoder(separators=(',', ':'), check_circular=False).encode
+
+
+def _encode_json(event):
+    return _dumps(event).encode()
+
+
+if ORJSON:
+    # Encodes straight to bytes in compiled code, using SIMD for string
+    # escaping. Faster than even the specialized encoders below.
+    _encode_json = orjson.dumps  # noqa: F811
+
+
+def _encode_json_float(value):
+    # Matches the output of `json.dumps` for non-finite values.
+    if value != value:
+        return 'NaN'
+    if value == float('inf'):
+        return 'Infinity'
+    if value == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+# Scalar types which may be JSON-encoded by the specialized event encoders,
+# mapped to functions returning their JSON representation.
+_JSON_SCALARS = {
+    str:        encode_basestring_ascii,
+    int:        int.__repr__,
+    float:      _encode_json_float,
+    bool:       lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null',
+}
+
+
+def _make_json_encoder(name, fields):
+    """
+    Generate a function which JSON-encodes an event from positional values
+    for its `fields`.
+
+    The event's structure is fixed so it is written into a template with
+    `%`-formatting, skipping construction of the event dictionaries and the
+    generic encoder entirely. The function returns `None` if a value is not
+    one of the :data:`_JSON_SCALARS`, in which case the caller should fall
+    back to the generic encoder.
+
+    :param name: Event name.
+    :type name: :class:`str`
+    :param fields: Event parameter names.
+    :type fields: :class:`tuple` of :class:`str`
+    :returns: Event encoder.
+    :rtype: :class:`callable`
+    """
+    template = '{{"event":{0},"params":{{{1}}}}}'.format(
+        encode_basestring_ascii(name),
+        ','.join(encode_basestring_ascii(f) + ':%s' for f in fields))
+    source = (
+        'def encode({0}):\n'
+        '    try:\n'
+        '        return (template % ({1},)).encode()\n'
+        '    except KeyError:\n'
+        '        return None\n'
+    ).format(', '.join(fields),
+             ', '.join('scalars[type({0})]({0})'.format(f) for f in fields))
+    namespace = {'template': template, 'scalars': _JSON_SCALARS}
+    exec(source, namespace)
+    return namespace['encode']
+
+
+# Specialized JSON encoders for each of the :data:`EVENT_SCHEMAS`.
+_JSON_EVENT_ENCODERS = {name: _make_json_encoder(name, fields)
+                        for name, fields in EVENT_SCHEMAS.items()}
+
+
+def _join_json_batch(payloads):
+    return b'{"event":"batch","params":[' + b','.join(payloads) + b']}'
+
+
+def _encode_msgpack(event):
+    return msgpack.packb(event, use_bin_type=True)
+
+
+def _join_msgpack_batch(payloads):
+    # A two-entry map header followed by the `event` entry and `params` key.
+    return (b'\x82' + _encode_msgpack('event') + _encode_msgpack('batch') +
+            _encode_msgpack('params') +
+            msgpack.Packer().pack_array_header(len(payloads)) +
+            b''.join(payloads))
+
+
+def _join_unencoded_batch(events):
+    return {'event': 'batch', 'params': list(events)}
+
+
+# Codecs available for encoding events sent from the printer, each mapped to
+# a function which encodes a single event and a function which joins a
+# sequence of encoded events into an encoded `batch` event. Events sent to a
+# consumer in the same process needn't be encoded at all.
+EVENT_CODECS = {
+    None:       (lambda event: event, _join_unencoded_batch),
+    'json':     (_encode_json, _join_json_batch),
+    'msgpack':  (_encode_msgpack, _join_msgpack_batch),
+}
+
+
+def decode_event(payload):
+    """
+    Decode an event sent by :class:`QueuedPrinterCallbacks` using any of the
+    :data:`EVENT_CODECS`.
+
+    JSON-encoded events always begin with `{` whereas a msgpack-encoded event
+    begins with a map header, so the codec is detected from the first byte.
+
+    :param payload: Encoded event.
+    :type payload: :class:`bytes`
+    :returns: Decoded event.
+    :rtype: :class:`dict`
+    """
+    if payload[:1] == b'{':
+        if ORJSON:
+            return orjson.loads(payload)
+        return json.loads(payload.decode())
+    return msgpack.unpackb(payload, raw=False)
 
 
 class NotReadyException(Exception):
@@ -32,8 +221,43 @@ class State(enum.Enum):
 class StateEncoder(json.JSONEncoder):
     """
     JSON encoder which serializes an Enum as a string of its name.
+
+    .. note::
+
+        Passing a custom encoder `cls` to :func:`json.dumps` forces it onto
+        the pure-Python encoder, so this should not be used on any frequently
+        called path. OpenGB itself converts enums to their names where events
+        and status are built (e.g. :meth:`QueuedPrinterCallbacks.state_change`)
+        and only retains this class for use by external code.
+
+    Objects are converted by a function looked up by their exact type, so
+    further types may be supported using :meth:`register`. Enums of other
+    types are still serialized by name.
     """
+
+    _DISPATCH = {State: operator.attrgetter('name')}
+
+    @classmethod
+    def register(cls, obj_type, fn):
+        """
+        Serialize objects of exactly `obj_type` using `fn`. Applies only to
+        this class and its future sub-classes.
+
+        :param obj_type: Type of object to be serialized.
+        :type obj_type: :class:`type`
+        :param fn: Function returning a JSON-serializable representation of
+            an object of `obj_type`.
+        :type fn: :class:`callable`
+        """
+        # Copy the inherited table rather than modify a superclass's.
+        if '_DISPATCH' not in cls.__dict__:
+            cls._DISPATCH = dict(cls._DISPATCH)
+        cls._DISPATCH[obj_type] = fn
+
     def default(self, obj):
+        fn = self._DISPATCH.get(type(obj))
+        if fn is not None:
+            return fn(obj)
         if isinstance(obj, enum.Enum):
             return obj.name
         return json.JSONEncoder.default(self, obj)
@@ -46,7 +270,10 @@ class PrinterCallbacks(object):
 
     This base class implements placeholder callbacks that don't
     actually do anything. You probably want to sub-class this to send events
-    to some kind of message queue.
+    to some kind of message queue. :class:`IPrinter` detects when these
+    placeholders are in use and sets `_callbacks_enabled` to `False` so that
+    implementations can skip preparing arguments for callbacks on frequently
+    executed paths.
 
     Inspired by _MachineComPrintCallback_ in Cura's `MachineCom
     <https://github.com/daid/Cura/blob/master/Cura/util/machineCom.py>`_
@@ -170,11 +397,24 @@ class PrinterCallbacks(object):
         pass
 
 
+def _to_float(value):
+    """
+    Convert a temperature or position, which printers may report as a
+    number or a numeric string, to a :class:`float`.
+
+    :returns: The value as a float, or `None` if it is `None` or not a
+        number.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class QueuedPrinterCallbacks(PrinterCallbacks):
     """
-    Printer callbacks that place event dictionary objects on a
-    :class:`multiprocessing.Queue`. These events have a similar structure
-    to that defined by
+    Printer callbacks that encode events (as JSON by default) and send them
+    to the server. These events have a similar structure to that defined by
     `JSON-RPC 2.0 <http://www.jsonrpc.org/specification>`_ . E.g.
 
         {
@@ -188,122 +428,387 @@ class QueuedPrinterCallbacks(PrinterCallbacks):
     This allows them to be easily converted into JSON-RPC 2.0 messages ready
     to be forwarded to a websocket-based event listener.
 
-    :param from_printer: A queue upon which to place callback messages.
-    :type from_printer: :class:`multiprocessing.Queue`
+    High-frequency events listed in :data:`BATCHED_EVENTS` are not placed on
+    the queue immediately. Instead they are collected by a background thread
+    and flushed every `batch_interval` seconds (or once `batch_max_events`
+    are pending) as a single `batch` event whose `params` are a list of
+    events. Successive `temp_update` events within each interval are merged
+    into one: as `None` indicates an unchanged temperature, the latest value
+    reported for each temperature is kept.
+    All other events are placed on the queue immediately.
+
+    Batched events are encoded as they arrive and the `batch` event is
+    assembled from the already-encoded events when flushed. A batch is
+    flushed early if adding an event would take the total encoded size of
+    its events past `batch_max_bytes`, bounding the size of any one message
+    the consumer must decode.
+
+    Temperature updates are also rate limited: a `temp_update` is dropped if
+    one was published less than `temp_min_interval` seconds ago and no
+    temperature has changed by `temp_min_delta` degrees or more since.
+    Progress updates are dropped unless progress has changed by at least
+    0.1% since the last one published in the current state.
+
+    Temperatures and positions are published as floats, or `None` if not
+    reported. If `telemetry` is given they are instead written to it in
+    place, without encoding or rate limiting, and the consumer is expected
+    to collect them from it.
+
+    Events are encoded to :class:`bytes` exactly once. If `from_printer`
+    provides `send_bytes` (e.g. :class:`opengb.printer.EventRing` or a
+    :class:`multiprocessing.connection.Connection`) the encoded event is
+    written directly, bypassing pickle, while holding a lock so that
+    messages sent by different threads are never interleaved. Otherwise it
+    is placed on `from_printer` with `put`.
+
+    JSON encoding uses `orjson <https://github.com/ijl/orjson>`_ if it is
+    installed. Otherwise events listed in :data:`EVENT_SCHEMAS` are encoded
+    by functions generated for their specific structure, falling back to the
+    standard library encoder only if a parameter value is not a simple
+    scalar. There are few enough :class:`State` values that every possible
+    `state_change` event is encoded up front.
+
+    Events may alternatively be encoded with `msgpack
+    <http://msgpack.org>`_, which is cheaper to produce than JSON, by
+    setting `codec` to `msgpack`. Use :func:`decode_event` to decode events
+    encoded with either codec. When the printer runs in the same process as
+    the consumer (see :class:`ThreadedIPrinter`) set `codec` to `None` to
+    place the event dictionaries on the queue without encoding them at all.
+
+    :param from_printer: Connection or queue to which to send events.
+    :type from_printer: :class:`opengb.printer.EventRing`,
+        :class:`multiprocessing.connection.Connection` or
+        :class:`multiprocessing.Queue`
+    :param batch_interval: Maximum time in seconds for which a batched event
+        is held before being placed on the queue.
+    :type batch_interval: :class:`float`
+    :param batch_max_events: Number of pending batched events which triggers
+        an immediate flush.
+    :type batch_max_events: :class:`int`
+    :param batch_max_bytes: Maximum total size of the encoded events in a
+        batch. Not applied to unencoded events.
+    :type batch_max_bytes: :class:`int`
+    :param codec: Name of the :data:`EVENT_CODECS` entry used to encode
+        events, or `None` to leave them unencoded.
+    :type codec: :class:`str`
+    :param temp_min_interval: Minimum time in seconds between unchanged
+        temperature updates.
+    :type temp_min_interval: :class:`float`
+    :param temp_min_delta: Temperature change in degrees which causes an
+        update to be published regardless of `temp_min_interval`.
+    :type temp_min_delta: :class:`float`
+    :param telemetry: Shared memory to which to write
+        :data:`TELEMETRY_EVENTS`.
+    :type telemetry: :class:`opengb.printer.Telemetry`
+    :raises: :class:`ValueError` if `codec` is unknown or unavailable.
     """
 
-    def __init__(self, from_printer):
+    def __init__(self, from_printer, batch_interval=BATCH_INTERVAL_SEC,
+                 batch_max_events=BATCH_MAX_EVENTS, codec='json',
+                 temp_min_interval=TEMP_UPDATE_MIN_INTERVAL_SEC,
+                 temp_min_delta=TEMP_UPDATE_MIN_DELTA,
+                 batch_max_bytes=BATCH_MAX_BYTES, telemetry=None):
+        if codec not in EVENT_CODECS:
+            raise ValueError('Unknown event codec: {0}'.format(codec))
+        if codec == 'msgpack' and not MSGPACK:
+            raise ValueError('The msgpack codec requires the msgpack package')
+        self._encode, self._join_batch = EVENT_CODECS[codec]
+        if codec == 'json' and not ORJSON:
+            self._event_encoders = _JSON_EVENT_ENCODERS
+        else:
+            self._event_encoders = None
+        # Unencoded events are mutable so can't be shared.
+        if codec is None:
+            self._state_change_events = None
+        else:
+            self._state_change_events = {
+                (old, new): self._encode_event('state_change',
+                                               (old.name, new.name))
+                for old in State for new in State}
         self._from_printer = from_printer
+        self._init_transport()
+        self._batch_interval = batch_interval
+        self._batch_max_events = batch_max_events
+        self._batch_max_bytes = batch_max_bytes if codec else None
+        # Pending (encoded event, size, parameter values) for each batched
+        # event.
+        self._batched = {name: collections.deque(maxlen=maxlen)
+                         for name, maxlen in BATCHED_EVENTS.items()}
+        self._batch_bytes = 0
+        self._flusher_pid = None
+        self._temp_min_interval = temp_min_interval
+        self._temp_min_delta = temp_min_delta
+        self._last_temp_time = 0.0
+        self._last_temp = (None,) * 6
+        self._last_progress_permille = -1
+        self._telemetry = telemetry
+
+    def __getstate__(self):
+        # Locks and events can't be pickled; they are recreated, along with
+        # the flusher thread, in whichever process unpickles us.
+        state = self.__dict__.copy()
+        del state['_send']
+        del state['_batch_lock']
+        del state['_batch_pending']
+        state['_flusher_pid'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_transport()
+
+    def _init_transport(self):
+        """
+        Create the process-local means of sending events to `from_printer`.
+        """
+        send_bytes = getattr(self._from_printer, 'send_bytes', None)
+        if send_bytes is None:
+            # Queues may be used by several threads at once.
+            self._send = self._from_printer.put
+        else:
+            # Connections may not: long messages are written in parts which
+            # could be interleaved with another thread's.
+            send_lock = threading.Lock()
+
+            def send(payload):
+                with send_lock:
+                    send_bytes(payload)
 
-    def _publish(self, event):
+            self._send = send
+        # Held from taking a batch until it has been sent so that batches are
+        # sent in the order they were taken.
+        self._batch_lock = threading.Lock()
+        self._batch_pending = threading.Event()
+
+    def _send_event(self, event):
         """
-        Publish an event from the printer to the `_from_printer` queue.
+        Encode an event from the printer and send it to `_from_printer`.
 
-        :param event: Event to be placed on the queue.
+        :param event: Event to be sent.
         :type event: :class:`dict`
         """
-        self._from_printer.put(event)
+        self._send(self._encode(event))
+
+    def _encode_event(self, name, values):
+        """
+        Encode an event with the given name and parameter values.
+
+        :param name: Name of one of the :data:`EVENT_SCHEMAS`.
+        :type name: :class:`str`
+        :param values: Values for each of the event's parameters.
+        :type values: :class:`tuple`
+        """
+        payload = None
+        if self._event_encoders is not None:
+            payload = self._event_encoders[name](*values)
+        if payload is None:
+            payload = self._encode({
+                'event':    name,
+                'params':   dict(zip(EVENT_SCHEMAS[name], values)),
+            })
+        return payload
+
+    def _publish(self, name, *values):
+        """
+        Publish an event with the given name and parameter values.
+
+        :param name: Name of one of the :data:`EVENT_SCHEMAS`.
+        :type name: :class:`str`
+        :param values: Values for each of the event's parameters.
+        """
+        self._send(self._encode_event(name, values))
+
+    def _publish_batched(self, name, *values):
+        """
+        Add an event with the given name and parameter values to the pending
+        batch, to be published by the flusher thread.
+
+        :param name: Name of one of the :data:`EVENT_SCHEMAS`.
+        :type name: :class:`str`
+        :param values: Values for each of the event's parameters.
+        """
+        batches = []
+        with self._batch_lock:
+            # Threads don't survive a fork so the flusher is started lazily
+            # in the process which actually publishes events.
+            if self._flusher_pid != os.getpid():
+                self._flusher_pid = os.getpid()
+                threading.Thread(target=self._run_flusher,
+                                 daemon=True).start()
+            pending = self._batched[name]
+            if pending.maxlen == 1 and pending:
+                # Coalesce with the pending event. A parameter which is `None`
+                # is unchanged so keeps its pending value.
+                __, size, pending_values = pending.pop()
+                self._batch_bytes -= size
+                values = tuple(
+                    pending_value if value is None else value
+                    for pending_value, value in zip(pending_values, values))
+            elif len(pending) == pending.maxlen:
+                # The oldest event is about to be replaced.
+                self._batch_bytes -= pending[0][1]
+            payload = self._encode_event(name, values)
+            size = 0 if self._batch_max_bytes is None else len(payload)
+            if (self._batch_max_bytes is not None and
+                    self._batch_bytes + size > self._batch_max_bytes):
+                batches.append(self._take_batch())
+            if (self._batch_max_bytes is not None and
+                    size > self._batch_max_bytes):
+                # Too big to fit in any batch so sent on its own.
+                batches.append(payload)
+            else:
+                pending.append((payload, size, values))
+                self._batch_bytes += size
+                if (sum(len(each) for each in self._batched.values()) >=
+                        self._batch_max_events):
+                    batches.append(self._take_batch())
+            for each in batches:
+                if each is not None:
+                    self._send(each)
+            waiting = any(self._batched.values())
+        if waiting:
+            self._batch_pending.set()
+
+    def _take_batch(self):
+        """
+        Remove all pending batched events and join them into a `batch` event.
+
+        Must be called with `_batch_lock` held.
+
+        :returns: Encoded `batch` event, or `None` if no events are pending.
+        """
+        payloads = []
+        for each in self._batched.values():
+            payloads.extend(entry[0] for entry in each)
+            each.clear()
+        self._batch_bytes = 0
+        if payloads:
+            return self._join_batch(payloads)
+        return None
+
+    def _run_flusher(self):
+        """
+        Loops forever flushing batched events `batch_interval` seconds after
+        the first event of each batch arrives.
+
+        Runs as a separate thread.
+        """
+        while True:
+            self._batch_pending.wait()
+            time.sleep(self._batch_interval)
+            self._batch_pending.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Publish all pending batched events as a single `batch` event.
+        """
+        with self._batch_lock:
+            batch = self._take_batch()
+            if batch is not None:
+                self._send(batch)
 
     def log(self, level, message):
-        self._publish({
-            'event':   'log',
-            'params':   {
-                'level':    level,
-                'msg':      message,
-            }
-        })
+        self._publish('log', level, message)
 
     def state_change(self, old, new):
-        self._publish({
-            'event':   'state_change',
-            'params':   {
-                'old':      old.name,
-                'new':      new.name,
-            }
-        })
+        # Progress of a new job must be published even if it matches the
+        # last progress of the previous one.
+        self._last_progress_permille = -1
+        if self._state_change_events is None:
+            self._publish('state_change', old.name, new.name)
+        else:
+            self._send(self._state_change_events[old, new])
 
     def speed_override_change(self, percent):
-     self._publish({
-            'event':   'speed_override_change',
-            'params':   {
-                'percent':      percent,
-            }
-        })
+        self._publish('speed_override_change', percent)
 
     def extrude_override_change(self, percent):
-     self._publish({
-            'event':   'extrude_override_change',
-            'params':   {
-                'percent':      percent,
-            }
-        })
+        self._publish('extrude_override_change', percent)
 
     def fan_speed_change(self, fan, percent):
-        self._publish({
-            'event':   'fan_speed_change',
-            'params':   {
-                'fan':          fan,
-                'percent':      percent,
-            }
-        })
+        self._publish('fan_speed_change', fan, percent)
+
+    def _temp_changed(self, temps):
+        """
+        Return `True` if any temperature differs from the last published
+        temperatures by at least `temp_min_delta`.
+
+        Temperatures may be floats or `None`.
+
+        :param temps: Temperatures in the order passed to
+            :meth:`temp_update`.
+        :type temps: :class:`tuple`
+        """
+        for old, new in zip(self._last_temp, temps):
+            if old == new:
+                continue
+            if old is None or new is None:
+                # Appeared or disappeared.
+                return True
+            if abs(new - old) >= self._temp_min_delta:
+                return True
+        return False
 
     def temp_update(self, bed_current, bed_target, nozzle1_current,
                     nozzle1_target, nozzle2_current, nozzle2_target):
-        self._publish({
-            'event':   'temp_update',
-            'params':   {
-                'bed_current':      bed_current,
-                'bed_target':       bed_target,
-                'nozzle1_current':  nozzle1_current,
-                'nozzle1_target':   nozzle1_target,
-                'nozzle2_current':  nozzle2_current,
-                'nozzle2_target':   nozzle2_target,
-            }
-        })
+        temps = tuple(_to_float(temp) for temp in (
+            bed_current, bed_target, nozzle1_current, nozzle1_target,
+            nozzle2_current, nozzle2_target))
+        if self._telemetry is not None:
+            self._telemetry.write('temp_update', temps)
+            return
+        now = time.monotonic()
+        if (now - self._last_temp_time < self._temp_min_interval and
+                not self._temp_changed(temps)):
+            return
+        self._last_temp_time = now
+        self._last_temp = temps
+        self._publish_batched('temp_update', *temps)
 
     def position_update(self, x, y, z):
-        self._publish({
-            'event':   'position_update',
-            'params':   {
-                'x':      x,
-                'y':      y,
-                'z':      z,
-            }
-        })
+        position = (_to_float(x), _to_float(y), _to_float(z))
+        if self._telemetry is not None:
+            self._telemetry.write('position_update', position)
+            return
+        self._publish_batched('position_update', *position)
 
     def progress_update(self, current_line, total_lines):
-        self._publish({
-            'event':   'progress_update',
-            'params':   {
-                'current_line': current_line,
-                'total_lines':  total_lines,
-            }
-        })
+        permille = (current_line * 1000) // max(total_lines, 1)
+        if permille == self._last_progress_permille:
+            return
+        self._last_progress_permille = permille
+        self._publish('progress_update', current_line, total_lines)
 
     def steppers_update(self, enabled):
-        self._publish({
-            'event':   'steppers_update',
-            'params':   {
-                'enabled':      enabled,
-            }
-        })
+        self._publish('steppers_update', enabled)
 
     def z_change(self, position):
-        self._publish({
-            'event':  'z_change',
-            'position':  position,
-        })
+        self._send_event({'event': 'z_change', 'position': position})
 
 
-class IPrinter(multiprocessing.Process):
+class IPrinter(object):
     """
-    Printer interface. Runs as a separate process to ensure uninterrupted
-    operation.
+    Printer interface. By default runs as a separate process to ensure
+    uninterrupted operation.
 
     Use a concrete implementation of this class.
 
-    :param to_printer: Queue containing messages for the printer.
-    :type to_printer: :class:`multiprocessing.Queue`
+    The concurrency primitive in which :meth:`run` executes once
+    :meth:`start` is called is given by :attr:`Executor`, and the function
+    creating a matching `(receiver, sender)` pair of connections for
+    `to_printer` by :attr:`Pipe`. See :class:`ThreadedIPrinter` for running
+    as a thread instead. The :class:`multiprocessing.Process` attributes
+    :attr:`name`, :attr:`pid` and :attr:`exitcode` and method
+    :meth:`terminate` are forwarded to the executor.
+
+    Messages are passed over a one-way pipe rather than a
+    :class:`multiprocessing.Queue` because there is only ever one sender and
+    one receiver, so the queue's locks and feeder thread are pure overhead.
+
+    :param to_printer: Connection from which messages for the printer are
+        received.
+    :type to_printer: :class:`multiprocessing.connection.Connection`
     :param printer_callbacks: Callbacks to be fired on printer events.
         TODO: mention defaults.
     :type printer_callbacks: :class:`PrinterCallbacks`
@@ -311,18 +816,85 @@ class IPrinter(multiprocessing.Process):
 
     __metaclass__ = abc.ABCMeta
 
+    Executor = multiprocessing.Process
+    Pipe = staticmethod(lambda: multiprocessing.Pipe(duplex=False))
+
     def __init__(self, to_printer, printer_callbacks=None, baud_rate=None,
                  port=None, lcd_gpio_pin=None):
         # Configuration.
         self._state = State.DISCONNECTED
-        # Print queue.
+        # Messages for the printer.
         self._to_printer = to_printer
         # Callbacks.
         if printer_callbacks is None:
             self._callbacks = PrinterCallbacks()
         else:
             self._callbacks = printer_callbacks
-        super().__init__()
+        # The placeholder callbacks do nothing, so work done only to build
+        # their arguments may be skipped.
+        self._callbacks_enabled = type(self._callbacks) is not PrinterCallbacks
+        # Execution.
+        self.daemon = False
+        self._executor = None
+
+    def start(self):
+        """
+        Start executing :meth:`run` in a new :attr:`Executor`.
+        """
+        self._executor = self.Executor(target=self.run, daemon=self.daemon)
+        self._executor.start()
+
+    def is_alive(self):
+        """
+        Return whether or not the printer is running.
+        """
+        return self._executor is not None and self._executor.is_alive()
+
+    def join(self, timeout=None):
+        """
+        Wait until the printer stops running.
+
+        :param timeout: Maximum time in seconds to wait.
+        :type timeout: :class:`float`
+        """
+        self._executor.join(timeout)
+
+    def terminate(self):
+        """
+        Terminate the printer. Only supported when :attr:`Executor` is a
+        process.
+        """
+        self._executor.terminate()
+
+    @property
+    def name(self):
+        """
+        Name of the executor, or `None` if the printer hasn't been started.
+        """
+        return None if self._executor is None else self._executor.name
+
+    @property
+    def pid(self):
+        """
+        Process ID of the executor, or `None` if the printer hasn't been
+        started or doesn't run in a process of its own.
+        """
+        return getattr(self._executor, 'pid', None)
+
+    @property
+    def exitcode(self):
+        """
+        Exit code of the executor, or `None` if the printer hasn't exited or
+        doesn't run in a process of its own.
+        """
+        return getattr(self._executor, 'exitcode', None)
+
+    @abc.abstractmethod
+    def run(self):
+        """
+        Printer run loop.
+        """
+        pass
 
     def _update_state(self, new_state):
 
@@ -554,3 +1126,33 @@ class IPrinter(multiprocessing.Process):
         Immediately stop the printer.
         """
         pass
+
+
+class ThreadedIPrinter(IPrinter):
+    """
+    Printer interface which runs as a thread in the current process.
+
+    Serial communication with a printer is I/O-bound and releases the GIL
+    while blocked, so a thread is sufficient in most cases. Running in-process
+    avoids the memory overhead of a second interpreter (significant on a
+    Raspberry Pi) and allows events to be passed without being serialized.
+
+    Inherit from this class, or use :func:`threaded` to derive a threaded
+    variant of an existing concrete :class:`IPrinter`.
+    """
+
+    Executor = threading.Thread
+    Pipe = staticmethod(local_pipe)
+
+
+def threaded(printer_type):
+    """
+    Derive a variant of a concrete :class:`IPrinter` which runs as a thread.
+
+    :param printer_type: Concrete printer class.
+    :type printer_type: :class:`type`
+    :returns: Threaded printer class.
+    :rtype: :class:`type`
+    """
+    return type('Threaded' + printer_type.__name__,
+                (ThreadedIPrinter, printer_type), {})
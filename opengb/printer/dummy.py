@@ -173,9 +173,11 @@ class Dummy(IPrinter):
         """
         Execute the next gcode command in the current sequence.
         """
-        self._callbacks.log(logging.DEBUG, 'Executing gcode command {0} at '
-            'position {1}'.format(self._gcode_sequence[self._gcode_position],
-                                  self._gcode_position))
+        if self._callbacks_enabled:
+            self._callbacks.log(logging.DEBUG, 'Executing gcode command {0} '
+                'at position {1}'.format(
+                    self._gcode_sequence[self._gcode_position],
+                    self._gcode_position))
         self._gcode_position += 1
         # Complete execution if previous line was last in sequence.
         if self._gcode_position >= len(self._gcode_sequence):
@@ -194,9 +196,9 @@ class Dummy(IPrinter):
             # Ensure connected
             if self._state == State.DISCONNECTED:
                 self._update_state(State.READY)
-            # Process a message from the to_printer queue.
-            if not self._to_printer.empty():
-                message = self._to_printer.get()
+            # Process a message from the to_printer connection.
+            if self._to_printer.poll():
+                message = self._to_printer.recv()
                 try:
                     if 'method' and 'params' in message.keys():
                         getattr(self, message['method'])(**message['params'])
@@ -0,0 +1,388 @@
+"""
+Inter-process transport for printer events.
+"""
+
+import os
+import ctypes
+import collections
+import multiprocessing
+import threading
+import time
+
+
+# Number of slots in the ring. Must be a power of two so that slot indices
+# remain correct when the 32-bit head/tail counters wrap around.
+DEFAULT_SLOTS = 1024
+# Maximum size of a message which fits in a single slot.
+DEFAULT_SLOT_BYTES = 512
+# Counters are padded to this many bytes so that head and tail live on
+# separate cache lines and producer/consumer writes don't false-share.
+CACHE_LINE_BYTES = 64
+# Delay between checks for free space (backlog) or a new event (consumer).
+POLL_WAIT_SEC = 0.001
+
+# Slot length indicating that the message was too big for a slot and must be
+# read from the overflow queue instead.
+_OVERFLOW = 0xFFFFFFFF
+_COUNTER_MASK = 0xFFFFFFFF
+_COUNTER_STRIDE = CACHE_LINE_BYTES // ctypes.sizeof(ctypes.c_uint32)
+_HEAD = 0
+_TAIL = _COUNTER_STRIDE
+_NAN = float('nan')
+
+
+class EventRing(object):
+    """
+    Single-producer, single-consumer ring buffer which carries encoded
+    events from the printer process to the server process through shared
+    memory.
+
+    Provides the byte-oriented subset of the
+    :class:`multiprocessing.connection.Connection` interface
+    (:meth:`send_bytes`, :meth:`recv_bytes` and :meth:`poll`) so it may be
+    used in place of one end of a :func:`multiprocessing.Pipe`.
+
+    Each message is copied into a fixed-size slot. The producer publishes a
+    slot by advancing the head counter only after the slot has been written;
+    the consumer releases it by advancing the tail counter. Neither side
+    takes a cross-process lock and the consumer is never woken: it simply
+    compares tail with head when polled.
+
+    Messages longer than `slot_bytes` are sent through an overflow
+    :func:`multiprocessing.Pipe` and their slot is marked so that ordering
+    is preserved.
+
+    The producer never waits for the consumer. Messages which can't be
+    written immediately, because the ring is full, they are too long for a
+    slot or earlier messages are still waiting, are held in a process-local
+    backlog which a background thread moves onto the ring as space becomes
+    free. As with an unbounded :class:`multiprocessing.Queue`, the backlog
+    grows for as long as the consumer doesn't keep up.
+
+    .. note::
+
+        Printer implementations may publish events from several threads so
+        writes are serialized by a process-local lock. There is still only a
+        single producing *process*.
+
+    .. warning::
+
+        Python provides no memory barriers, so on weakly-ordered CPUs (e.g.
+        ARM) nothing guarantees that the store publishing a slot becomes
+        visible to the consumer after the stores writing it. In practice
+        each store is separated by many interpreter instructions, but this
+        is not a guarantee.
+
+    :param slots: Number of slots in the ring (a power of two).
+    :type slots: :class:`int`
+    :param slot_bytes: Maximum size of a message held in a slot.
+    :type slot_bytes: :class:`int`
+    """
+
+    def __init__(self, slots=DEFAULT_SLOTS, slot_bytes=DEFAULT_SLOT_BYTES):
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError('Number of slots must be a power of two')
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._buffer = multiprocessing.RawArray(ctypes.c_char,
+                                                slots * slot_bytes)
+        self._lengths = multiprocessing.RawArray(ctypes.c_uint32, slots)
+        self._counters = multiprocessing.RawArray(ctypes.c_uint32,
+                                                  2 * _COUNTER_STRIDE)
+        self._overflow_reader, self._overflow_writer = multiprocessing.Pipe(
+            duplex=False)
+        self._init_producer()
+
+    def _init_producer(self):
+        """
+        Initialize the process-local state of the producer.
+        """
+        self._write_lock = threading.Lock()
+        # Messages waiting to be placed on the ring, oldest first.
+        self._backlog = collections.deque()
+        self._backlog_pending = threading.Event()
+        self._drainer_pid = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_write_lock', '_backlog', '_backlog_pending',
+                     '_drainer_pid'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_producer()
+
+    def _size(self):
+        """
+        Return the number of published messages not yet consumed.
+        """
+        return (self._counters[_HEAD] - self._counters[_TAIL]) & _COUNTER_MASK
+
+    def poll(self):
+        """
+        Return `True` if there is a message waiting to be consumed.
+        """
+        return self._counters[_HEAD] != self._counters[_TAIL]
+
+    def _publish(self, payload):
+        """
+        Write a message into a free slot and publish it, or if `payload` is
+        `None` publish an overflow marker. The write lock must be held.
+        """
+        head = self._counters[_HEAD]
+        slot = head & (self._slots - 1)
+        if payload is None:
+            self._lengths[slot] = _OVERFLOW
+        else:
+            ctypes.memmove(ctypes.addressof(self._buffer) +
+                           slot * self._slot_bytes,
+                           payload, len(payload))
+            self._lengths[slot] = len(payload)
+        # Publish only once the slot is completely written (but see the
+        # warning in the class docstring).
+        self._counters[_HEAD] = (head + 1) & _COUNTER_MASK
+
+    def send_bytes(self, payload):
+        """
+        Place a message on the ring, or on the backlog if it can't be placed
+        on the ring immediately. Never waits for the consumer.
+
+        :param payload: Message to be placed on the ring.
+        :type payload: :class:`bytes`
+        """
+        with self._write_lock:
+            if (not self._backlog and len(payload) <= self._slot_bytes and
+                    self._size() < self._slots):
+                self._publish(payload)
+                return
+            # Threads don't survive a fork so the drainer is started lazily
+            # in the process which actually sends messages.
+            if self._drainer_pid != os.getpid():
+                self._drainer_pid = os.getpid()
+                threading.Thread(target=self._run_drainer,
+                                 daemon=True).start()
+            self._backlog.append(payload)
+            self._backlog_pending.set()
+
+    def _run_drainer(self):
+        """
+        Move messages from the backlog onto the ring as space becomes free.
+        """
+        while True:
+            self._backlog_pending.wait()
+            oversized = None
+            with self._write_lock:
+                while self._backlog and self._size() < self._slots:
+                    payload = self._backlog[0]
+                    if len(payload) > self._slot_bytes:
+                        # Mark the slot, then send the message outside the
+                        # lock: writing a message larger than the OS pipe
+                        # buffer waits until the consumer starts reading it.
+                        # Only this thread writes to the overflow pipe so
+                        # messages on it remain in order.
+                        self._publish(None)
+                        oversized = self._backlog.popleft()
+                        break
+                    self._publish(self._backlog.popleft())
+                if not self._backlog and oversized is None:
+                    self._backlog_pending.clear()
+            if oversized is not None:
+                self._overflow_writer.send_bytes(oversized)
+            elif self._backlog_pending.is_set():
+                # The ring is full.
+                time.sleep(POLL_WAIT_SEC)
+
+    def flush(self):
+        """
+        Wait until every message sent by this process has been placed on the
+        ring. A producer process should call this before exiting, as the
+        thread which empties the backlog doesn't outlive it.
+        """
+        while self._backlog_pending.is_set():
+            time.sleep(POLL_WAIT_SEC)
+
+    def recv_bytes(self):
+        """
+        Remove and return the next message from the ring, waiting for one to
+        be published if the ring is empty.
+
+        :returns: The next message.
+        :rtype: :class:`bytes`
+        """
+        tail = self._counters[_TAIL]
+        while tail == self._counters[_HEAD]:
+            time.sleep(POLL_WAIT_SEC)
+        slot = tail & (self._slots - 1)
+        length = self._lengths[slot]
+        if length == _OVERFLOW:
+            payload = self._overflow_reader.recv_bytes()
+        else:
+            payload = ctypes.string_at(ctypes.addressof(self._buffer) +
+                                       slot * self._slot_bytes, length)
+        # Release the slot back to the producer.
+        self._counters[_TAIL] = (tail + 1) & _COUNTER_MASK
+        return payload
+
+
+class Telemetry(object):
+    """
+    Latest values of frequently updated printer readings (e.g. temperatures
+    and position) held in shared memory.
+
+    Rather than sending every reading as an event the producer overwrites
+    the previous values in place, and the consumer periodically collects
+    those which have changed as events using :meth:`changed_events`.
+    Intermediate readings which the consumer doesn't see are lost, which is
+    fine for telemetry where only the latest value matters.
+
+    Each record is guarded by a sequence counter (a seqlock): the producer
+    makes it odd while writing and even once done, and the consumer retries
+    any read during which the counter was odd or changed. Neither side
+    blocks the other.
+
+    Values are stored as floats. Writing `None` leaves the previous value
+    unchanged, so readings which only update some values are merged rather
+    than lost. Values which have never been written are read as `None`.
+
+    :param schemas: Parameter names for each event carried, keyed by event
+        name.
+    :type schemas: :class:`dict`
+    """
+
+    def __init__(self, schemas):
+        self._schemas = dict(schemas)
+        self._offsets = {}
+        offset = 0
+        for name, params in sorted(self._schemas.items()):
+            self._offsets[name] = (len(self._offsets), offset,
+                                   offset + len(params))
+            offset += len(params)
+        self._values = multiprocessing.RawArray(ctypes.c_double,
+                                                [_NAN] * offset)
+        self._seqs = multiprocessing.RawArray(
+            ctypes.c_uint32, len(self._offsets) * _COUNTER_STRIDE)
+        # Sequence number of each record when last read by the consumer.
+        self._read_seqs = {name: 0 for name in self._schemas}
+        self._write_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_write_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._write_lock = threading.Lock()
+
+    def write(self, name, values):
+        """
+        Overwrite the values of a record.
+
+        :param name: Name of the event whose values are written.
+        :type name: :class:`str`
+        :param values: Value for each of the event's parameters, or `None`
+            to leave a value unchanged.
+        :type values: :class:`tuple` of :class:`float`
+        """
+        index, start, end = self._offsets[name]
+        index *= _COUNTER_STRIDE
+        with self._write_lock:
+            seq = self._seqs[index]
+            self._seqs[index] = (seq + 1) & _COUNTER_MASK
+            for offset, value in enumerate(values, start):
+                if value is not None:
+                    self._values[offset] = value
+            self._seqs[index] = (seq + 2) & _COUNTER_MASK
+
+    def _read(self, name):
+        """
+        Return a consistent snapshot of a record.
+
+        :returns: Sequence number and values of the record.
+        :rtype: :class:`tuple`
+        """
+        index, start, end = self._offsets[name]
+        index *= _COUNTER_STRIDE
+        while True:
+            seq = self._seqs[index]
+            if seq & 1:
+                # The producer is part way through writing.
+                time.sleep(0)
+                continue
+            values = self._values[start:end]
+            if self._seqs[index] == seq:
+                return seq, values
+
+    def changed_events(self):
+        """
+        Return an event for each record written since the last call.
+
+        :returns: Events in the same form as those published by
+            :class:`opengb.printer.QueuedPrinterCallbacks`.
+        :rtype: :class:`list` of :class:`dict`
+        """
+        events = []
+        for name, params in self._schemas.items():
+            index = self._offsets[name][0] * _COUNTER_STRIDE
+            if self._seqs[index] == self._read_seqs[name]:
+                continue
+            seq, values = self._read(name)
+            self._read_seqs[name] = seq
+            events.append({
+                'event': name,
+                'params': {param: None if value != value else value
+                           for param, value in zip(params, values)}})
+        return events
+
+
+class LocalConnection(object):
+    """
+    Both ends of an in-process, one-way pipe of objects.
+
+    Provides the object-oriented subset of the
+    :class:`multiprocessing.connection.Connection` interface (:meth:`send`,
+    :meth:`recv` and :meth:`poll`) without pickling objects or making system
+    calls. Use :func:`local_pipe` to create one.
+    """
+
+    def __init__(self):
+        # Appending to and popping from opposite ends of a deque are atomic
+        # so no lock is required.
+        self._messages = collections.deque()
+
+    def poll(self):
+        """
+        Return `True` if there is a message waiting to be received.
+        """
+        return bool(self._messages)
+
+    def send(self, obj):
+        """
+        Send an object.
+
+        :param obj: Object to send.
+        """
+        self._messages.append(obj)
+
+    def recv(self):
+        """
+        Receive the next object. Use :meth:`poll` first to check that there
+        is one.
+
+        :returns: The next object.
+        :raises: :class:`IndexError` if no object is waiting.
+        """
+        return self._messages.popleft()
+
+
+def local_pipe():
+    """
+    In-process equivalent of `multiprocessing.Pipe(duplex=False)`.
+
+    :returns: Receiving and sending ends of the pipe.
+    :rtype: :class:`tuple` of :class:`LocalConnection`
+    """
+    connection = LocalConnection()
+    return connection, connection
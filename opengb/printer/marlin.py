@@ -244,11 +244,13 @@ class Marlin(IPrinter):
             the queue.
         :type deduplicate: :class:`bool`
         """
-        self._callbacks.log(logging.DEBUG, 'Queueing '
-                            'command: ' + str(command))
-        if deduplicate and command in self._gcode_command_queue:
-            self._callbacks.log(logging.DEBUG, 'Deduplicated queued '
+        if self._callbacks_enabled:
+            self._callbacks.log(logging.DEBUG, 'Queueing '
                                 'command: ' + str(command))
+        if deduplicate and command in self._gcode_command_queue:
+            if self._callbacks_enabled:
+                self._callbacks.log(logging.DEBUG, 'Deduplicated queued '
+                                    'command: ' + str(command))
             return
         self._gcode_command_queue.append(command)
 
@@ -275,8 +277,9 @@ class Marlin(IPrinter):
                 if buffer and self._serial_buffer.full():
                     raise BufferFullException('Buffer full. Unable to send '
                                               'command: ' + str(command))
-                self._callbacks.log(logging.DEBUG,
-                                    'Sending command: ' + str(command))
+                if self._callbacks_enabled:
+                    self._callbacks.log(logging.DEBUG,
+                                        'Sending command: ' + str(command))
                 try:
                     self._serial.write(command + b'\n')
                     self._serial_buffer.put(command)
@@ -357,9 +360,10 @@ class Marlin(IPrinter):
         for each in RESPONSE_MSG_PATTERNS:
             matched = each[0].match(message)
             if matched:
-                self._callbacks.log(logging.DEBUG,
-                                    'Parsed response: ' + message)
-                each[1](matched.groupdict(), self._callbacks)
+                if self._callbacks_enabled:
+                    self._callbacks.log(logging.DEBUG,
+                                        'Parsed response: ' + message)
+                    each[1](matched.groupdict(), self._callbacks)
                 # Response message indicates a command was processed so pop.
                 # an item off the serial buffer.
                 self._pop_serial_buffer()
@@ -367,9 +371,10 @@ class Marlin(IPrinter):
         for each in EVENT_MSG_PATTERNS:
             matched = each[0].match(message)
             if matched:
-                self._callbacks.log(logging.DEBUG,
-                                    'Parsed event: ' + message)
-                each[1](matched.groupdict(), self._callbacks)
+                if self._callbacks_enabled:
+                    self._callbacks.log(logging.DEBUG,
+                                        'Parsed event: ' + message)
+                    each[1](matched.groupdict(), self._callbacks)
                 return
         for each in STATE_CHANGE_MSG_PATTERNS:
             matched = each[0].match(message)
@@ -615,7 +620,7 @@ class Marlin(IPrinter):
         Loops forver sending messages to the printer:
 
         * Requesting metric updates.
-        * Forwarding message from the `self._to_printer` queue.
+        * Forwarding message from the `self._to_printer` connection.
         * Executing buffered priority gcode commands
         * Executing buffered sequence of gcode commands
 
@@ -637,9 +642,9 @@ class Marlin(IPrinter):
                 metric_interval > self._temp_poll_ready_sec):
                 self._request_printer_temperature()
                 self._temp_update_time = time.time()
-            # Process a message from the to_printer queue.
-            if not self._to_printer.empty():
-                message = self._to_printer.get()
+            # Process a message from the to_printer connection.
+            if self._to_printer.poll():
+                message = self._to_printer.recv()
                 try:
                     self._process_message_to_printer(message)
                 except KeyError as err:
@@ -667,8 +672,8 @@ class Marlin(IPrinter):
     def _process_message_to_printer(self, message):
         """
         Process a message that was sent to the printer via the
-        :obj:`self._to_printer` queue by calling the specified `method` with
-        the specified `params`.
+        :obj:`self._to_printer` connection by calling the specified `method`
+        with the specified `params`.
 
         A message should be a dictionary containing values for `method` and
         `params`. E.g.
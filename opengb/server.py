@@ -2,13 +2,13 @@
 OpenGB server.
 
 This is the core of openGB. It creates a printer object to run in a separate
-process and communicates with it via queues.
+process (or thread) and communicates with it via pipes.
 """
 
 import os
 import sys
 import json
-import multiprocessing
+import queue
 import datetime
 from pkg_resources import Requirement, resource_filename
 
@@ -31,6 +31,10 @@ LOGGER = tornado.log.app_log
 # Websocket clients.
 CLIENTS = []
 
+# Maximum number of messages (events or batches of events) received from the
+# printer each time it is polled.
+MAX_PRINTER_MESSAGES_PER_POLL = 100
+
 # Local cache of printer state.
 PRINTER = {
     'state':    opengb.printer.State.DISCONNECTED,
@@ -69,8 +73,9 @@ class MessageHandler(object):
     """
     Handles JSON-RPC calls received via websocket.
 
-    :param to_printer: A queue whose messages will be sent to the printer.
-    :type to_printer: :class:`multiuprocessing.Queue`
+    :param to_printer: A connection whose messages will be sent to the
+        printer.
+    :type to_printer: :class:`multiprocessing.connection.Connection`
     """
 
     def __init__(self, to_printer):
@@ -89,7 +94,7 @@ class MessageHandler(object):
         :param nozzle2: Nozzle2 target temperature.
         :type nozzle2: :class:`float`
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'set_temp',
             'params': {
                 'bed':      bed,
@@ -113,7 +118,7 @@ class MessageHandler(object):
         :param rate: Rate at which to move in mm/s.
         :type rate: :class:`float`
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'move_head_relative',
             'params': {
                 'x':        x,
@@ -137,7 +142,7 @@ class MessageHandler(object):
         :param rate: Rate at which to move in mm/s.
         :type rate: :class:`float`
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'move_head_absolute',
             'params': {
                 'x':        x,
@@ -159,7 +164,7 @@ class MessageHandler(object):
         :param z: Whether or not to home the Z axis.
         :type z: :class:`bool`
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'home_head',
             'params': {
                 'x':    x,
@@ -182,7 +187,7 @@ class MessageHandler(object):
         """
         if head not in [0, 1]:
             raise IndexError('Head must be either 0 or 1')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'retract_filament',
             'params': {
                 'head':     head,
@@ -205,7 +210,7 @@ class MessageHandler(object):
         """
         if head not in [0, 1]:
             raise IndexError('Head must be either 0 or 1')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'unretract_filament',
             'params': {
                 'head':     head,
@@ -224,7 +229,7 @@ class MessageHandler(object):
         """
         if percent not in range(0,101):
             raise IndexError('Percent must be 0-100')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'set_extrude_override_percent',
             'params': {
                 'percent':     percent,
@@ -241,7 +246,7 @@ class MessageHandler(object):
         """
         if percent not in range(0,101):
             raise IndexError('Percent must be 0-100')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'set_speed_override_percent',
             'params': {
                 'percent':     percent,
@@ -268,7 +273,7 @@ class MessageHandler(object):
             This method may be called internally as the result of a filament
             detection script being triggered.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'filament_swap_begin',
             'params': {}
         })
@@ -279,7 +284,7 @@ class MessageHandler(object):
         """
         if self.PRINTER['state'] != opengb.printer.State.FILAMENT_SWAP:
             raise IndexError('Printer must be in FILAMENT_SWAP state')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'filament_swap_complete',
             'params': {}
         })
@@ -297,7 +302,7 @@ class MessageHandler(object):
             raise IndexError('Fan must be 0-2')
         if percent not in range(0,101):
             raise IndexError('Percent must be 0-100')
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'set_fan_speed',
             'params': {
                 'fan':         fan,
@@ -311,7 +316,7 @@ class MessageHandler(object):
 
         Prevents motors and axes from moving freely.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'enable_steppers',
             'params': {}
         })
@@ -323,7 +328,7 @@ class MessageHandler(object):
 
         Allows motors and axes to moving freely.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'disable_steppers',
             'params': {}
         })
@@ -333,7 +338,7 @@ class MessageHandler(object):
         """
         Pause the current print job.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'pause_execution',
             'params': {}
         })
@@ -343,7 +348,7 @@ class MessageHandler(object):
         """
         Resume a paused print job.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'resume_execution',
             'params': {}
         })
@@ -355,7 +360,7 @@ class MessageHandler(object):
 
         The current print job status and position will be discarded.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'stop_execution',
             'params': {}
         })
@@ -370,7 +375,7 @@ class MessageHandler(object):
             Use only in emergencies as this will most likely lock the printer
             and require a reboot.
         """
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'emergency_stop',
             'params': {}
         })
@@ -538,7 +543,7 @@ class MessageHandler(object):
                          '{1}'.format(id, err))
             raise IndexError('Error reading gcode file with '
                              'id {0}'.format(id))
-        self._to_printer.put({
+        self._to_printer.send({
             'method':   'execute_gcode',
             'params': {
                 'gcode_sequence':    gcode,
@@ -619,7 +624,11 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
 
 class StatusHandler(RequestHandler):
     def get(self):
-        self.write(json.dumps(PRINTER, cls=opengb.printer.StateEncoder))
+        # Enums don't serialise so replace with name. This keeps json.dumps
+        # on its C-accelerated path, which a custom encoder `cls` disables.
+        printer = PRINTER.copy()
+        printer['state'] = printer['state'].name
+        self.write(json.dumps(printer))
         self.set_header("Content-Type", "application/json")
 
 
@@ -664,26 +673,53 @@ def process_event(event):
         LOGGER.error('Malformed event from printer: {0}'.format(event))
 
 
-def process_printer_events(from_printer):
+def process_printer_events(from_printer, telemetry=None):
     """
     Process events from printer.
 
     Runs via a :class:`tornado.ioloop.PeriodicCallback`.
 
-    :param from_printer: A queue which will be populated with messages sent
-        from the printer.
-    :type from_printer: :class:`multiuprocessing.Queue`
+    :param from_printer: Connection from which to receive encoded events
+        sent from the printer, or a queue of unencoded events if the printer
+        runs in this process.
+    :type from_printer: :class:`opengb.printer.EventRing` or
+        :class:`queue.Queue`
+    :param telemetry: Shared memory to which the printer writes temperature
+        and position updates, if any.
+    :type telemetry: :class:`opengb.printer.Telemetry`
     """
-    if not from_printer.empty():
+    if hasattr(from_printer, 'recv_bytes'):
+        pending = from_printer.poll
+        receive = lambda: opengb.printer.decode_event(
+            from_printer.recv_bytes())
+    else:
+        pending = lambda: not from_printer.empty()
+        receive = from_printer.get_nowait
+    # Drain the events published since the last poll rather than one per
+    # tick so that bursts of events don't back up, but stop at a limit so
+    # that a steady stream of events can't starve other callbacks.
+    for i in range(MAX_PRINTER_MESSAGES_PER_POLL):
+        if not pending():
+            break
         try:
-            event = from_printer.get()
-            if event['event'] == 'log':
-                LOGGER.log(event['params']['level'], event['params']['msg'])
+            event = receive()
+            # Batched events are unpacked and handled individually.
+            if event['event'] == 'batch':
+                events = event['params']
             else:
-                broadcast_message(event)
-                process_event(event)
-        except TypeError as e:
+                events = [event]
+            for each in events:
+                if each['event'] == 'log':
+                    LOGGER.log(each['params']['level'], each['params']['msg'])
+                else:
+                    broadcast_message(each)
+                    process_event(each)
+        except (TypeError, ValueError) as e:
             LOGGER.exception(e)
+    if telemetry is not None:
+        for event in telemetry.changed_events():
+            broadcast_message(event)
+            process_event(event)
 
 
 def update_counters(count=1):
@@ -740,14 +776,25 @@ def main():
     # Initialize database.
     OGD.initialize(options.db_file)
 
-    # Initialize printer queues.
-    to_printer = multiprocessing.Queue()
-    from_printer = multiprocessing.Queue()
+    # Initialize printer queues. A threaded printer shares our process so
+    # its events needn't be encoded.
+    printer_type = getattr(opengb.printer, options.printer)
+    if options.printer_threaded:
+        printer_type = opengb.printer.threaded(printer_type)
+        from_printer = queue.Queue()
+        event_codec = None
+        telemetry = None
+    else:
+        from_printer = opengb.printer.EventRing()
+        event_codec = options.event_codec
+        # Temperature and position are shared in place rather than sent.
+        telemetry = opengb.printer.Telemetry(opengb.printer.TELEMETRY_EVENTS)
+    from_server, to_printer = printer_type.Pipe()
 
     # Initialize printer using queue callbacks.
-    printer_callbacks = opengb.printer.QueuedPrinterCallbacks(from_printer)
-    printer_type = getattr(opengb.printer, options.printer)
-    printer = printer_type(to_printer, printer_callbacks,
+    printer_callbacks = opengb.printer.QueuedPrinterCallbacks(
+        from_printer, codec=event_codec, telemetry=telemetry)
+    printer = printer_type(from_server, printer_callbacks,
                            baud_rate=options.baud_rate,
                            port=options.serial_port,
                            lcd_gpio_pin=options.lcd_gpio_pin)
@@ -770,7 +817,8 @@ def main():
     # Create event loop and periodic callbacks
     main_loop = tornado.ioloop.IOLoop.instance()
     printer_event_processor = tornado.ioloop.PeriodicCallback(
-        lambda: process_printer_events(from_printer), 10, io_loop=main_loop)
+        lambda: process_printer_events(from_printer, telemetry), 10,
+        io_loop=main_loop)
     counter_updater = tornado.ioloop.PeriodicCallback(
         lambda: update_counters(), 60000)
     # TODO: ioloop for watchdog
@@ -0,0 +1,652 @@
+"""
+Opengb printer unit tests.
+"""
+
+import enum
+import json
+import queue
+import time
+import logging
+import unittest
+import threading
+import multiprocessing
+from unittest.mock import patch
+
+from opengb.tests import OpengbTestCase
+from opengb.printer import EventRing
+from opengb.printer import Telemetry
+from opengb.printer import TELEMETRY_EVENTS
+from opengb.printer.ipc import local_pipe
+from opengb.printer import PrinterCallbacks
+from opengb.printer import QueuedPrinterCallbacks
+from opengb.printer import decode_event
+from opengb.printer import State
+from opengb.printer import StateEncoder
+from opengb.printer import Dummy
+from opengb.printer import IPrinter
+from opengb.printer import ThreadedIPrinter
+from opengb.printer import threaded
+from opengb.printer.base import MSGPACK
+from opengb.printer.base import _JSON_EVENT_ENCODERS
+
+
+def _send_messages(ring, count):
+    for i in range(count):
+        ring.send_bytes(str(i).encode())
+    ring.flush()
+
+
+def _write_positions(telemetry, count):
+    for i in range(count):
+        telemetry.write('position_update', (i, i, i))
+
+
+class SlowFlusherConnection(object):
+
+    def __init__(self):
+        self.payloads = []
+
+    def send_bytes(self, payload):
+        if threading.current_thread() is not threading.main_thread():
+            time.sleep(0.01)
+        self.payloads.append(payload)
+
+
+class TestEventRing(OpengbTestCase):
+
+    def setUp(self):
+        self.ring = EventRing(slots=4, slot_bytes=64)
+
+    def test_new_ring_is_empty(self):
+        """A newly created ring contains no messages."""
+        self.assertFalse(self.ring.poll())
+
+    def test_messages_returned_in_order(self):
+        """Messages are returned in the order they were sent."""
+        self.ring.send_bytes(b'a')
+        self.ring.send_bytes(b'b')
+        self.assertEqual(self.ring.recv_bytes(), b'a')
+        self.assertEqual(self.ring.recv_bytes(), b'b')
+        self.assertFalse(self.ring.poll())
+
+    def test_slots_reused_after_wrap(self):
+        """Slots are reused once the ring wraps around."""
+        for i in range(10):
+            self.ring.send_bytes(str(i).encode())
+            self.assertEqual(self.ring.recv_bytes(), str(i).encode())
+
+    def test_oversized_message_preserves_order(self):
+        """Messages too large for a slot are returned in order."""
+        big = b'x' * 200
+        self.ring.send_bytes(b'a')
+        self.ring.send_bytes(big)
+        self.ring.send_bytes(b'b')
+        self.assertEqual(self.ring.recv_bytes(), b'a')
+        self.assertEqual(self.ring.recv_bytes(), big)
+        self.assertEqual(self.ring.recv_bytes(), b'b')
+
+    def test_full_ring_does_not_block_producer(self):
+        """Messages sent while the ring is full and the consumer is stalled
+        are held back without blocking the producer."""
+        producer = threading.Thread(
+            target=lambda: [self.ring.send_bytes(str(i).encode())
+                            for i in range(20)])
+        producer.start()
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+        received = [int(self.ring.recv_bytes()) for i in range(20)]
+        self.assertEqual(received, list(range(20)))
+
+    def test_oversized_message_does_not_block_producer(self):
+        """Messages larger than the OS pipe buffer don't block the
+        producer while the consumer is stalled."""
+        big = b'x' * (1024 * 1024)
+        producer = threading.Thread(
+            target=lambda: [self.ring.send_bytes(m) for m in (big, b'a')])
+        producer.start()
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(self.ring.recv_bytes(), big)
+        self.assertEqual(self.ring.recv_bytes(), b'a')
+
+    def test_slots_must_be_power_of_two(self):
+        """Ring size must be a power of two."""
+        with self.assertRaises(ValueError):
+            EventRing(slots=3)
+
+    def test_messages_cross_process_boundary(self):
+        """Messages sent by another process are received in order."""
+        producer = multiprocessing.Process(target=_send_messages,
+                                           args=(self.ring, 20))
+        producer.start()
+        received = [int(self.ring.recv_bytes()) for i in range(20)]
+        producer.join()
+        self.assertEqual(received, list(range(20)))
+
+
+class TestTelemetry(OpengbTestCase):
+
+    def setUp(self):
+        self.telemetry = Telemetry(TELEMETRY_EVENTS)
+
+    def test_unwritten_records_not_returned(self):
+        """No events are returned for records which haven't been written."""
+        self.assertEqual(self.telemetry.changed_events(), [])
+
+    def test_latest_values_returned_once(self):
+        """Only the latest values of a written record are returned, once."""
+        self.telemetry.write('position_update', (1, 2, 3))
+        self.telemetry.write('position_update', (4, 5, 6))
+        self.assertEqual(self.telemetry.changed_events(), [{
+            'event': 'position_update',
+            'params': {'x': 4.0, 'y': 5.0, 'z': 6.0}}])
+        self.assertEqual(self.telemetry.changed_events(), [])
+
+    def test_none_leaves_value_unchanged(self):
+        """Writing `None` keeps the previous value, and values never
+        written are read as `None`."""
+        self.telemetry.write('temp_update',
+                             (60.5, 60.0, 200.0, 210.0, None, None))
+        self.telemetry.write('temp_update',
+                             (61.0, 60.0, None, None, None, None))
+        event, = self.telemetry.changed_events()
+        self.assertEqual(event['params'], {
+            'bed_current': 61.0, 'bed_target': 60.0,
+            'nozzle1_current': 200.0, 'nozzle1_target': 210.0,
+            'nozzle2_current': None, 'nozzle2_target': None})
+
+    def test_values_cross_process_boundary(self):
+        """Values written by another process are read consistently."""
+        writer = multiprocessing.Process(target=_write_positions,
+                                         args=(self.telemetry, 1000))
+        writer.start()
+        events = []
+        while writer.is_alive():
+            events.extend(self.telemetry.changed_events())
+        writer.join()
+        events.extend(self.telemetry.changed_events())
+        for event in events:
+            self.assertEqual(event['params']['x'], event['params']['z'])
+        self.assertEqual(events[-1]['params']['x'], 999.0)
+
+    def test_callbacks_convert_values(self):
+        """Callbacks write numeric strings as floats and unknown values as
+        `None`."""
+        callbacks = QueuedPrinterCallbacks(queue.Queue(),
+                                           telemetry=self.telemetry)
+        callbacks.temp_update('60.5', 60, None, None, 'bad', 0)
+        event, = self.telemetry.changed_events()
+        self.assertEqual(event['params'], {
+            'bed_current': 60.5, 'bed_target': 60.0,
+            'nozzle1_current': None, 'nozzle1_target': None,
+            'nozzle2_current': None, 'nozzle2_target': 0.0})
+
+    def test_callbacks_write_telemetry(self):
+        """Callbacks write temperature and position to telemetry."""
+        from_printer = queue.Queue()
+        callbacks = QueuedPrinterCallbacks(from_printer,
+                                           telemetry=self.telemetry)
+        callbacks.position_update(1, 2, 3)
+        callbacks.temp_update(1, 2, 3, 4, 5, 6)
+        callbacks.flush()
+        self.assertTrue(from_printer.empty())
+        self.assertEqual(
+            sorted(e['event'] for e in self.telemetry.changed_events()),
+            ['position_update', 'temp_update'])
+
+
+class TestQueuedPrinterCallbacksBatching(OpengbTestCase):
+
+    def setUp(self):
+        self.from_printer = queue.Queue()
+        # A long interval ensures the flusher never fires during a test.
+        self.callbacks = QueuedPrinterCallbacks(self.from_printer,
+                                                batch_interval=60,
+                                                batch_max_events=3)
+
+    def get_event(self):
+        return json.loads(self.from_printer.get_nowait().decode())
+
+    def test_log_published_immediately(self):
+        """Log events are not batched."""
+        self.callbacks.log(logging.INFO, 'hello')
+        self.assertEqual(self.get_event()['event'], 'log')
+
+    def test_position_update_held_until_flush(self):
+        """Position updates are held and published as a batch on flush."""
+        self.callbacks.position_update(1, 2, 3)
+        self.callbacks.position_update(4, 5, 6)
+        self.assertTrue(self.from_printer.empty())
+        self.callbacks.flush()
+        batch = self.get_event()
+        self.assertEqual(batch['event'], 'batch')
+        self.assertEqual([e['params']['x'] for e in batch['params']], [1, 4])
+
+    def test_temp_update_coalesced(self):
+        """Only the most recent temp update in a batch is kept."""
+        self.callbacks.temp_update(1, 2, 3, 4, 5, 6)
+        self.callbacks.temp_update(7, 8, 9, 10, 11, 12)
+        self.callbacks.flush()
+        batch = self.get_event()
+        self.assertEqual(len(batch['params']), 1)
+        self.assertEqual(batch['params'][0]['params']['bed_current'], 7)
+
+    def test_partial_temp_update_merged(self):
+        """A partial temp update merges with a pending full one."""
+        callbacks = QueuedPrinterCallbacks(self.from_printer, codec=None,
+                                           batch_interval=60,
+                                           temp_min_interval=0)
+        callbacks.temp_update('60.0', '60.0', '200.0', '210.0', None, None)
+        callbacks.temp_update(None, None, '201.0', None, None, None)
+        callbacks.flush()
+        batch = self.from_printer.get_nowait()
+        self.assertEqual([e['params'] for e in batch['params']], [{
+            'bed_current': 60.0, 'bed_target': 60.0,
+            'nozzle1_current': 201.0, 'nozzle1_target': 210.0,
+            'nozzle2_current': None, 'nozzle2_target': None}])
+
+    def test_batches_sent_in_order(self):
+        """Batches are sent in the order they were taken even when the
+        flusher thread is slow to send them."""
+        connection = SlowFlusherConnection()
+        callbacks = QueuedPrinterCallbacks(connection, batch_interval=0.001,
+                                           batch_max_events=2)
+        for i in range(1000):
+            callbacks.position_update(i, i, i)
+            if i % 100 == 0:
+                # Give the flusher a chance to take a batch.
+                time.sleep(0.002)
+        callbacks.flush()
+        xs = [e['params']['x'] for payload in connection.payloads
+              for e in decode_event(payload)['params']]
+        self.assertEqual(xs, sorted(xs))
+
+    def test_batch_flushed_when_full(self):
+        """A batch is published as soon as it reaches the maximum size."""
+        for i in range(3):
+            self.callbacks.position_update(i, i, i)
+        self.assertEqual(len(self.get_event()['params']), 3)
+
+    def test_batch_flushed_before_exceeding_max_bytes(self):
+        """A batch is published before it would exceed the maximum size."""
+        callbacks = QueuedPrinterCallbacks(self.from_printer,
+                                           batch_interval=60,
+                                           batch_max_bytes=130)
+        callbacks.position_update(1, 1, 1)
+        callbacks.position_update(2, 2, 2)
+        self.assertTrue(self.from_printer.empty())
+        callbacks.position_update(3, 3, 3)
+        batch = self.get_event()
+        self.assertEqual([e['params']['x'] for e in batch['params']], [1, 2])
+        callbacks.flush()
+        batch = self.get_event()
+        self.assertEqual([e['params']['x'] for e in batch['params']], [3])
+
+    def test_event_exceeding_max_bytes_published_alone(self):
+        """An event too big for any batch is published immediately."""
+        callbacks = QueuedPrinterCallbacks(self.from_printer,
+                                           batch_interval=60,
+                                           batch_max_bytes=40)
+        callbacks.position_update(1, 2, 3)
+        self.assertEqual(self.get_event(), {
+            'event': 'position_update',
+            'params': {'x': 1, 'y': 2, 'z': 3}})
+
+    def test_flush_without_events_publishes_nothing(self):
+        """Flushing an empty batch does not publish anything."""
+        self.callbacks.flush()
+        self.assertTrue(self.from_printer.empty())
+
+
+class TestQueuedPrinterCallbacksTransport(OpengbTestCase):
+
+    def test_events_sent_as_bytes_over_connection(self):
+        """Events are written as JSON bytes when a connection is given."""
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        QueuedPrinterCallbacks(sender).log(logging.INFO, 'hello')
+        self.assertEqual(json.loads(receiver.recv_bytes().decode()), {
+            'event': 'log',
+            'params': {'level': logging.INFO, 'msg': 'hello'}})
+
+    def test_concurrent_sends_not_interleaved(self):
+        """Long events sent over a connection by several threads at once
+        are received intact."""
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        callbacks = QueuedPrinterCallbacks(sender)
+        messages = [c * (100 * 1024) for c in 'abcd']
+        threads = [threading.Thread(
+            target=lambda m=m: [callbacks.log(logging.INFO, m)
+                                for i in range(10)]) for m in messages]
+        for thread in threads:
+            thread.start()
+        received = [decode_event(receiver.recv_bytes())['params']['msg']
+                    for i in range(40)]
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(received), sorted(messages * 10))
+
+    def test_events_put_as_bytes_on_queue(self):
+        """Events are placed on a queue as JSON bytes."""
+        from_printer = queue.Queue()
+        QueuedPrinterCallbacks(from_printer).log(logging.INFO, 'hello')
+        self.assertIsInstance(from_printer.get_nowait(), bytes)
+
+
+class TestEventCodecs(OpengbTestCase):
+
+    def setUp(self):
+        self.from_printer = queue.Queue()
+
+    def test_json_event_decoded(self):
+        """JSON-encoded events are decoded."""
+        QueuedPrinterCallbacks(self.from_printer).steppers_update(True)
+        self.assertEqual(decode_event(self.from_printer.get_nowait()), {
+            'event': 'steppers_update', 'params': {'enabled': True}})
+
+    @unittest.skipUnless(MSGPACK, 'msgpack not installed')
+    def test_msgpack_batch_decoded(self):
+        """msgpack-encoded batches are decoded."""
+        callbacks = QueuedPrinterCallbacks(self.from_printer, codec='msgpack')
+        callbacks.position_update(1, 2, 3)
+        callbacks.position_update(4, 5, 6)
+        callbacks.flush()
+        self.assertEqual(decode_event(self.from_printer.get_nowait()), {
+            'event': 'batch',
+            'params': [
+                {'event': 'position_update',
+                 'params': {'x': 1, 'y': 2, 'z': 3}},
+                {'event': 'position_update',
+                 'params': {'x': 4, 'y': 5, 'z': 6}},
+            ]})
+
+    @unittest.skipUnless(MSGPACK, 'msgpack not installed')
+    def test_msgpack_event_decoded(self):
+        """msgpack-encoded events are decoded."""
+        QueuedPrinterCallbacks(self.from_printer,
+                               codec='msgpack').steppers_update(True)
+        self.assertEqual(decode_event(self.from_printer.get_nowait()), {
+            'event': 'steppers_update', 'params': {'enabled': True}})
+
+    def test_unknown_codec_rejected(self):
+        """An unknown codec raises a ValueError."""
+        with self.assertRaises(ValueError):
+            QueuedPrinterCallbacks(self.from_printer, codec='xml')
+
+
+class TestStateEncoder(OpengbTestCase):
+
+    def test_state_encoded_as_name(self):
+        """States are serialized as their names."""
+        self.assertEqual(json.dumps({'state': State.READY}, cls=StateEncoder),
+                         '{"state": "READY"}')
+
+    def test_other_enum_encoded_as_name(self):
+        """Enums without a registered function are serialized by name."""
+        colour = enum.Enum('Colour', 'RED')
+        self.assertEqual(json.dumps(colour.RED, cls=StateEncoder), '"RED"')
+
+    def test_unsupported_type_rejected(self):
+        """Types which can't be serialized raise a `TypeError`."""
+        with self.assertRaises(TypeError):
+            json.dumps(object(), cls=StateEncoder)
+
+    def test_registered_type_encoded(self):
+        """Registered types are serialized using their function."""
+        class Encoder(StateEncoder):
+            pass
+        Encoder.register(complex, lambda o: [o.real, o.imag])
+        self.assertEqual(json.dumps(1 + 2j, cls=Encoder), '[1.0, 2.0]')
+        self.assertEqual(json.dumps(State.READY, cls=Encoder), '"READY"')
+
+    def test_registration_not_inherited_upwards(self):
+        """Types registered on a sub-class aren't serialized by its
+        superclass."""
+        class Encoder(StateEncoder):
+            pass
+        Encoder.register(complex, lambda o: [o.real, o.imag])
+        with self.assertRaises(TypeError):
+            json.dumps(1 + 2j, cls=StateEncoder)
+
+
+class TestSpecializedEventEncoders(OpengbTestCase):
+
+    def setUp(self):
+        self.from_printer = queue.Queue()
+        self.callbacks = QueuedPrinterCallbacks(self.from_printer)
+
+    def get_event(self):
+        return json.loads(self.from_printer.get_nowait().decode())
+
+    def test_scalars_encoded(self):
+        """Scalar parameter values are encoded as JSON."""
+        self.callbacks.log(logging.INFO, 'say "hi" \u00e9')
+        self.callbacks.fan_speed_change(1, 50.5)
+        self.callbacks.steppers_update(False)
+        self.assertEqual(self.get_event(), {
+            'event': 'log',
+            'params': {'level': logging.INFO, 'msg': 'say "hi" \u00e9'}})
+        self.assertEqual(self.get_event(), {
+            'event': 'fan_speed_change',
+            'params': {'fan': 1, 'percent': 50.5}})
+        self.assertEqual(self.get_event(), {
+            'event': 'steppers_update', 'params': {'enabled': False}})
+
+    def test_state_change_encoded(self):
+        """State changes are encoded with state names."""
+        self.callbacks.state_change(State.READY, State.EXECUTING)
+        self.assertEqual(self.get_event(), {
+            'event': 'state_change',
+            'params': {'old': 'READY', 'new': 'EXECUTING'}})
+
+    def test_non_scalar_encoded(self):
+        """Non-scalar parameter values are encoded."""
+        self.callbacks.speed_override_change([1, 2])
+        self.assertEqual(self.get_event(), {
+            'event': 'speed_override_change', 'params': {'percent': [1, 2]}})
+
+    def test_specialized_encoder_non_finite_floats(self):
+        """Non-finite floats are encoded as they are by `json.dumps`."""
+        encode = _JSON_EVENT_ENCODERS['speed_override_change']
+        self.assertEqual(encode(float('inf')),
+                         b'{"event":"speed_override_change",'
+                         b'"params":{"percent":Infinity}}')
+
+    def test_specialized_encoder_rejects_non_scalar(self):
+        """Specialized encoders leave non-scalar values to the fallback."""
+        encode = _JSON_EVENT_ENCODERS['speed_override_change']
+        self.assertIsNone(encode([1, 2]))
+
+
+class TestTempUpdateRateLimit(OpengbTestCase):
+
+    def setUp(self):
+        self.from_printer = queue.Queue()
+        self.callbacks = QueuedPrinterCallbacks(self.from_printer,
+                                                batch_max_events=1,
+                                                temp_min_interval=60,
+                                                temp_min_delta=0.5)
+
+    def published_temps(self):
+        temps = []
+        while not self.from_printer.empty():
+            batch = json.loads(self.from_printer.get_nowait().decode())
+            temps.extend(e['params']['bed_current'] for e in batch['params'])
+        return temps
+
+    def test_unchanged_temp_dropped_within_interval(self):
+        """Unchanged temps are not published again within the interval."""
+        self.callbacks.temp_update(100, 110, 200, 210, None, None)
+        self.callbacks.temp_update(100, 110, 200, 210, None, None)
+        self.assertEqual(self.published_temps(), [100])
+
+    def test_small_change_dropped_within_interval(self):
+        """Temp changes below the minimum delta are not published."""
+        self.callbacks.temp_update('100.0', 110, 200, 210, None, None)
+        self.callbacks.temp_update('100.4', 110, 200, 210, None, None)
+        self.assertEqual(self.published_temps(), [100.0])
+
+    def test_large_change_published_within_interval(self):
+        """Temp changes of at least the minimum delta are published."""
+        self.callbacks.temp_update('100.0', 110, 200, 210, None, None)
+        self.callbacks.temp_update('100.5', 110, 200, 210, None, None)
+        self.assertEqual(self.published_temps(), [100.0, 100.5])
+
+    def test_temp_appearing_published_within_interval(self):
+        """A temp changing from `None` to a value is published."""
+        self.callbacks.temp_update(100, 110, 200, 210, None, None)
+        self.callbacks.temp_update(100, 110, 200, 210, 200, None)
+        self.assertEqual(self.published_temps(), [100, 100])
+
+    def test_unchanged_temp_published_after_interval(self):
+        """Unchanged temps are published once the interval has passed."""
+        callbacks = QueuedPrinterCallbacks(self.from_printer,
+                                           batch_max_events=1,
+                                           temp_min_interval=0)
+        callbacks.temp_update(100, 110, 200, 210, None, None)
+        callbacks.temp_update(100, 110, 200, 210, None, None)
+        self.assertEqual(self.published_temps(), [100, 100])
+
+
+class TestProgressUpdateFilter(OpengbTestCase):
+
+    def setUp(self):
+        self.from_printer = queue.Queue()
+        self.callbacks = QueuedPrinterCallbacks(self.from_printer)
+
+    def published_progress(self):
+        progress = []
+        while not self.from_printer.empty():
+            event = decode_event(self.from_printer.get_nowait())
+            if event['event'] == 'progress_update':
+                progress.append(event['params']['current_line'])
+        return progress
+
+    def test_unchanged_progress_dropped(self):
+        """Progress within the same 0.1% is not published again."""
+        for line in range(0, 3000, 500):
+            self.callbacks.progress_update(line, 3000000)
+        self.callbacks.progress_update(3000, 3000000)
+        self.assertEqual(self.published_progress(), [0, 3000])
+
+    def test_progress_published_after_state_change(self):
+        """A new job's progress is published even if it matches the last."""
+        self.callbacks.progress_update(1, 1)
+        self.callbacks.state_change(State.EXECUTING, State.READY)
+        self.callbacks.progress_update(2, 2)
+        self.assertEqual(self.published_progress(), [1, 2])
+
+    def test_zero_total_lines(self):
+        """Progress with no lines to execute is published."""
+        self.callbacks.progress_update(0, 0)
+        self.assertEqual(self.published_progress(), [0])
+
+
+class RecordingPrinter(ThreadedIPrinter):
+
+    def run(self):
+        self.run_thread = threading.current_thread()
+
+
+class ExitingPrinter(IPrinter):
+
+    def run(self):
+        pass
+
+
+class TestIPrinter(OpengbTestCase):
+
+    def test_process_attributes_forwarded(self):
+        """Process attributes are available once the printer has run."""
+        printer = ExitingPrinter(ExitingPrinter.Pipe()[0])
+        self.assertIsNone(printer.pid)
+        printer.start()
+        printer.join()
+        self.assertIsInstance(printer.pid, int)
+        self.assertEqual(printer.exitcode, 0)
+        self.assertTrue(printer.name)
+
+    def test_thread_has_no_pid(self):
+        """A threaded printer has no process ID or exit code."""
+        printer = RecordingPrinter(RecordingPrinter.Pipe()[0])
+        printer.start()
+        printer.join()
+        self.assertIsNone(printer.pid)
+        self.assertIsNone(printer.exitcode)
+
+
+class TestThreadedIPrinter(OpengbTestCase):
+
+    def test_runs_in_thread(self):
+        """A threaded printer runs in a thread of the current process."""
+        printer = RecordingPrinter(RecordingPrinter.Pipe()[0])
+        printer.start()
+        printer.join()
+        self.assertIsNot(printer.run_thread, threading.main_thread())
+        self.assertFalse(printer.is_alive())
+
+    def test_threaded_variant_of_concrete_printer(self):
+        """A threaded variant of a concrete printer uses threads."""
+        printer_type = threaded(Dummy)
+        self.assertTrue(issubclass(printer_type, Dummy))
+        self.assertIs(printer_type.Executor, threading.Thread)
+
+    def test_unencoded_events_for_in_process_consumer(self):
+        """Events are not encoded when no codec is used."""
+        from_printer = queue.Queue()
+        callbacks = QueuedPrinterCallbacks(from_printer, codec=None)
+        callbacks.steppers_update(True)
+        callbacks.state_change(State.READY, State.PAUSED)
+        self.assertEqual(from_printer.get_nowait(), {
+            'event': 'steppers_update', 'params': {'enabled': True}})
+        self.assertEqual(from_printer.get_nowait(), {
+            'event': 'state_change',
+            'params': {'old': 'READY', 'new': 'PAUSED'}})
+
+    def test_temps_published_as_floats(self):
+        """Temperatures are published as floats as they are when shared
+        through telemetry."""
+        from_printer = queue.Queue()
+        callbacks = QueuedPrinterCallbacks(from_printer, codec=None,
+                                           batch_max_events=1)
+        callbacks.temp_update('60.5', 60, None, None, None, None)
+        batch = from_printer.get_nowait()
+        self.assertEqual(batch['params'][0]['params'], {
+            'bed_current': 60.5, 'bed_target': 60.0,
+            'nozzle1_current': None, 'nozzle1_target': None,
+            'nozzle2_current': None, 'nozzle2_target': None})
+
+
+class TestLocalPipe(OpengbTestCase):
+
+    def test_objects_received_in_order(self):
+        """Objects are received unchanged in the order they were sent."""
+        receiver, sender = local_pipe()
+        message = {'method': 'set_temp', 'params': {'bed': 100}}
+        self.assertFalse(receiver.poll())
+        sender.send(message)
+        sender.send(None)
+        self.assertTrue(receiver.poll())
+        self.assertIs(receiver.recv(), message)
+        self.assertIsNone(receiver.recv())
+        self.assertFalse(receiver.poll())
+
+
+class TestCallbacksEnabled(OpengbTestCase):
+
+    def test_disabled_with_placeholder_callbacks(self):
+        """Callbacks are disabled when placeholders are used."""
+        self.assertFalse(RecordingPrinter(None)._callbacks_enabled)
+        self.assertFalse(RecordingPrinter(
+            None, PrinterCallbacks())._callbacks_enabled)
+
+    def test_enabled_with_real_callbacks(self):
+        """Callbacks are enabled when sub-classed callbacks are used."""
+        callbacks = QueuedPrinterCallbacks(queue.Queue())
+        self.assertTrue(RecordingPrinter(None, callbacks)._callbacks_enabled)
+
+    def test_placeholder_callbacks_patchable(self):
+        """Placeholder callbacks can be patched on an instance."""
+        callbacks = PrinterCallbacks()
+        with patch.object(callbacks, 'log') as log:
+            callbacks.log(logging.INFO, 'message')
+        log.assert_called_once_with(logging.INFO, 'message')
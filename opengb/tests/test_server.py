@@ -12,7 +12,7 @@ TODO:
 """
 
 import os
-from multiprocessing import Queue
+from multiprocessing import Pipe
 import json
 import tempfile
 import shutil
@@ -56,20 +56,20 @@ GCODE = """
 class TestSetTemp(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
     def test_pass_set_temps_method_to_printer(self):
         """Valid temps result in 'set_temp' message on the to_printer queue."""
         self.message_handler.set_temp(bed=100, nozzle1=200, nozzle2=200)
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "set_temp")
 
     def test_valid_set_temps_passed_to_printer(self):
         """Valid temps are added as a message on the to_printer queue."""
         self.message_handler.set_temp(bed=100, nozzle1=200, nozzle2=200)
-        self.assertDictEqual(self.to_printer.get(), {
+        self.assertDictEqual(self.from_server.recv(), {
             "method": "set_temp",
             "params": {"bed": 100, "nozzle2": 200, "nozzle1": 200}})
 
@@ -77,25 +77,25 @@ class TestSetTemp(OpengbTestCase):
         """Unspecified bed_temperature is passed to_the printer as None."""
         self.message_handler.set_temp(nozzle1=200, nozzle2=200)
         self.assertEqual(
-            self.to_printer.get()["params"]["bed"], None)
+            self.from_server.recv()["params"]["bed"], None)
 
     def test_set_nozzle1_temp_defaults_to_none(self):
         """Unspecified nozzle1_temperature is passed to_the printer as None."""
         self.message_handler.set_temp(bed=100, nozzle2=200)
         self.assertEqual(
-            self.to_printer.get()["params"]["nozzle1"], None)
+            self.from_server.recv()["params"]["nozzle1"], None)
 
     def test_set_nozzle2_temp_defaults_to_none(self):
         """Unspecified nozzle2_temperature is passed to_the printer as None."""
         self.message_handler.set_temp(bed=100, nozzle1=200)
         self.assertEqual(
-            self.to_printer.get()["params"]["nozzle2"], None)
+            self.from_server.recv()["params"]["nozzle2"], None)
 
 
 class TestMoveHeadRelative(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
@@ -103,13 +103,13 @@ class TestMoveHeadRelative(OpengbTestCase):
         """Valid x,y,z,rate vals result in 'move_head_relative' msg on
         to_printer queue."""
         self.message_handler.move_head_relative(x=0.02, y=-4, z=2, rate=60)
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "move_head_relative")
 
     def test_valid_xyzr_passed_to_printer(self):
         """Valid x,y,z,rate vals are added as msg on to_printer queue."""
         self.message_handler.move_head_relative(x=0.02, y=-4, z=2, rate=60)
-        self.assertDictEqual(self.to_printer.get(), {
+        self.assertDictEqual(self.from_server.recv(), {
             "method": "move_head_relative",
             "params": {"x": 0.02, "y": -4, "z": 2, "rate": 60}})
 
@@ -117,25 +117,25 @@ class TestMoveHeadRelative(OpengbTestCase):
         """Unspecified x is passed to_the printer as 0."""
         self.message_handler.move_head_relative(y=-4, z=2)
         self.assertEqual(
-            self.to_printer.get()["params"]["x"], 0)
+            self.from_server.recv()["params"]["x"], 0)
 
     def test_move_head_relative_y_defaults_to_zero(self):
         """Unspecified y is passed to_the printer as 0."""
         self.message_handler.move_head_relative(x=0.02, z=2)
         self.assertEqual(
-            self.to_printer.get()["params"]["y"], 0)
+            self.from_server.recv()["params"]["y"], 0)
 
     def test_move_head_relative_z_defaults_to_zero(self):
         """Unspecified z is passed to_the printer as 0."""
         self.message_handler.move_head_relative(x=0.02, y=-4)
         self.assertEqual(
-            self.to_printer.get()["params"]["z"], 0)
+            self.from_server.recv()["params"]["z"], 0)
 
 
 class TestMoveHeadAbsolute(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
@@ -143,13 +143,13 @@ class TestMoveHeadAbsolute(OpengbTestCase):
         """Valid x,y,z vals result in 'move_head_absolute' msg on to_printer
         queue."""
         self.message_handler.move_head_absolute(x=105, y=80, z=20)
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "move_head_absolute")
 
     def test_valid_xyzr_passed_to_printer(self):
         """Valid x,y,z vals are added as msg on to_printer queue."""
         self.message_handler.move_head_absolute(x=105, y=80, z=20, rate=60)
-        self.assertDictEqual(self.to_printer.get(), {
+        self.assertDictEqual(self.from_server.recv(), {
             "method": "move_head_absolute",
             "params": {"x": 105, "y": 80, "z": 20, "rate": 60}})
 
@@ -157,38 +157,38 @@ class TestMoveHeadAbsolute(OpengbTestCase):
         """Unspecified x is passed to_the printer as 0."""
         self.message_handler.move_head_absolute(y=80, z=20)
         self.assertEqual(
-            self.to_printer.get()["params"]["x"], 0)
+            self.from_server.recv()["params"]["x"], 0)
 
     def test_move_head_absolute_y_defaults_to_zero(self):
         """Unspecified y is passed to_the printer as 0."""
         self.message_handler.move_head_absolute(x=105, z=20)
         self.assertEqual(
-            self.to_printer.get()["params"]["y"], 0)
+            self.from_server.recv()["params"]["y"], 0)
 
     def test_move_head_absolute_z_defaults_to_zero(self):
         """Unspecified z is passed to_the printer as 0."""
         self.message_handler.move_head_absolute(x=105, y=80)
         self.assertEqual(
-            self.to_printer.get()["params"]["z"], 0)
+            self.from_server.recv()["params"]["z"], 0)
 
 
 class TestHomeHead(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
     def test_pass_home_head_method_to_printer(self):
         """Valid x,y,z vals result in 'home_head' msg on to_printer queue."""
         self.message_handler.home_head(x=True, y=True, z=False)
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "home_head")
 
     def test_valid_xyz_passed_to_printer(self):
         """Valid x,y,z vals are added as a msg on to_printer queue."""
         self.message_handler.home_head(x=True, y=True, z=False)
-        self.assertDictEqual(self.to_printer.get(), {
+        self.assertDictEqual(self.from_server.recv(), {
             "method": "home_head",
             "params": {"x": True, "y": True, "z": False}})
 
@@ -196,48 +196,48 @@ class TestHomeHead(OpengbTestCase):
         """Unspecified x is passed to_the printer as True."""
         self.message_handler.home_head(y=True, z=False)
         self.assertEqual(
-            self.to_printer.get()["params"]["x"], True)
+            self.from_server.recv()["params"]["x"], True)
 
 
 class TestEnableSteppers(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
     def test_pass_enable_steppers_method_to_printer(self):
         """Enable steppers adds 'enable_steppers' msg to to_printer queue."""
         self.message_handler.enable_steppers()
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "enable_steppers")
 
 
 class TestDisableSteppers(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
     def test_pass_disable_steppers_method_to_printer(self):
         """Disable steppers adds 'disable_steppers' msg to to_printer queue."""
         self.message_handler.disable_steppers()
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "disable_steppers")
 
 
 class TestEmergencyStop(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
     def test_pass_emergency_stop_method_to_printer(self):
         """Emergency stop adds 'emergency_stop' msg to to_printer queue."""
         self.message_handler.emergency_stop()
-        self.assertEqual(self.to_printer.get()["method"],
+        self.assertEqual(self.from_server.recv()["method"],
                          "emergency_stop")
 
 
@@ -245,7 +245,7 @@ class TestPutGCodeFile(OpengbTestCase):
 
     def setUp(self):
         self.db = SqliteDatabase(':memory:')
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.gcode = GCODE
@@ -305,7 +305,7 @@ class TestGetGCodeFile(OpengbTestCase):
 
     def setUp(self):
         self.db = SqliteDatabase(':memory:')
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.gcode = GCODE
@@ -346,7 +346,7 @@ class TestGetGCodeFiles(OpengbTestCase):
 
     def setUp(self):
         self.db = SqliteDatabase(':memory:')
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.uploaded = datetime.now()
@@ -421,7 +421,7 @@ class TestDeleteGCodeFile(OpengbTestCase):
 
     def setUp(self):
         self.db = SqliteDatabase(':memory:')
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.gcode = GCODE
@@ -454,7 +454,7 @@ class TestGetCounters(OpengbTestCase):
             'motor_z2_up_mins':         777,
             'filament_up_mins':         777,
         }
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
 
@@ -470,7 +470,7 @@ class TestGetCounters(OpengbTestCase):
 class TestGetStatus(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.test_status = {
@@ -524,7 +524,7 @@ class TestGetStatus(OpengbTestCase):
 class TestGetFilesystemUtilization(OpengbTestCase):
 
     def setUp(self):
-        self.to_printer = Queue()
+        self.from_server, self.to_printer = Pipe(duplex=False)
         self.message_handler = server.MessageHandler(
             to_printer=self.to_printer)
         self.fs_utilization = {
@@ -24,6 +24,10 @@ setup(
         'psutil>=4.1,<5',
         'RPi.GPIO>=0.6.2,<0.7',
     ],
+    extras_require={
+        'msgpack': ['msgpack>=0.5.2'],
+        'orjson': ['orjson'],
+    },
     tests_require=[
     ],
     classifiers=[